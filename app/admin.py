@@ -9,6 +9,13 @@ class UserProfileInline(admin.StackedInline):
     model = UserProfile
     can_delete = False
     verbose_name_plural = 'Profile'
+    raw_id_fields = ('user',)
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        # Keep the user widget to a narrow queryset instead of loading every column
+        if db_field.name == 'user':
+            kwargs['queryset'] = User.objects.only('id', 'username')
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 # Inline for WorkConfiguration to show in User admin
 class WorkConfigurationInline(admin.StackedInline):
@@ -16,15 +23,22 @@ class WorkConfigurationInline(admin.StackedInline):
     can_delete = False
     verbose_name_plural = 'Work Configuration'
     extra = 0
+    raw_id_fields = ('user',)
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'user':
+            kwargs['queryset'] = User.objects.only('id', 'username')
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 # Extend the existing User Admin
 class CustomUserAdmin(BaseUserAdmin):
     inlines = (UserProfileInline, WorkConfigurationInline)
     
-    def get_inline_instances(self, request, obj=None):
-        if not obj:
-            return list()
-        return super().get_inline_instances(request, obj)
+    def get_inlines(self, request, obj=None):
+        # Skip inline formset construction (and its queries) on the add page
+        if obj is None:
+            return ()
+        return super().get_inlines(request, obj)
 
 # Re-register UserAdmin
 admin.site.unregister(User)
@@ -34,32 +48,55 @@ admin.site.register(User, CustomUserAdmin)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'role']
     list_filter = ['role']
+    list_select_related = ['user']
     search_fields = ['user__username', 'user__first_name', 'user__last_name']
 
 @admin.register(Timestamp)
 class TimestampAdmin(admin.ModelAdmin):
     list_display = ['employee', 'timestamp', 'is_entry']
     list_filter = ['is_entry', 'timestamp']
+    list_select_related = ['employee']
     search_fields = ['employee__username']
     date_hierarchy = 'timestamp'
+    list_per_page = 25
+    list_max_show_all = 200
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # Only the rendered columns (plus employee.username for the row link)
+        return super().get_queryset(request).only(
+            'id', 'timestamp', 'is_entry', 'employee__username'
+        )
 
 @admin.register(WorkConfiguration)
 class WorkConfigurationAdmin(admin.ModelAdmin):
     list_display = ['user', 'hours_per_day', 'hourly_rate', 'cutoff_type', 'bonus']
     list_filter = ['cutoff_type']
+    list_select_related = ['user']
     search_fields = ['user__username']
 
 @admin.register(DailyWorkSummary)
 class DailyWorkSummaryAdmin(admin.ModelAdmin):
     list_display = ['employee', 'date', 'time_in', 'time_out', 'total_hours', 'late_minutes', 'net_pay']
     list_filter = ['date']
+    list_select_related = ['employee']
     search_fields = ['employee__username']
     date_hierarchy = 'date'
+    list_per_page = 25
+    list_max_show_all = 200
+    show_full_result_count = False
     readonly_fields = ['late_deduction_minutes', 'gross_pay', 'deductions', 'net_pay']
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).only(
+            'id', 'date', 'time_in', 'time_out', 'total_hours',
+            'late_minutes', 'net_pay', 'employee__username'
+        )
+
 @admin.register(PayrollPeriod)
 class PayrollPeriodAdmin(admin.ModelAdmin):
     list_display = ['employee', 'period_type', 'start_date', 'end_date', 'total_hours', 'net_pay', 'is_finalized']
     list_filter = ['period_type', 'is_finalized', 'start_date']
+    list_select_related = ['employee']
     search_fields = ['employee__username']
     readonly_fields = ['total_hours', 'total_gross_pay', 'total_deductions', 'net_pay']
\ No newline at end of file
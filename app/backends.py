@@ -0,0 +1,17 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+
+
+class ProfileSelectRelatedBackend(ModelBackend):
+    """
+    ModelBackend that loads the profile and work config together with the
+    session user, so request.user.profile / .work_config never cost an
+    extra query in decorators, views or templates.
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = User._default_manager.select_related('profile', 'work_config').get(pk=user_id)
+        except User.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -1,31 +1,49 @@
-from django.shortcuts import redirect
-from django.contrib.auth.decorators import user_passes_test
-from .models import UserProfile
+from functools import wraps
+
+from django.contrib.auth.views import redirect_to_login
+
+# Session key holding the cached role; set on first check and at login
+SESSION_ROLE_KEY = 'role'
 
 def role_required(allowed_roles=None):
     """
     Decorator to check if a user belongs to a specific role using UserProfile.
-    
+
+    The role is cached in the session after the first lookup, so repeated
+    requests skip the profile read entirely. A role change therefore takes
+    effect on the user's next login (sessions are per-browser, so there is
+    no server-side hook to rewrite them when a profile is edited).
+
     Args:
         allowed_roles (list): A list of roles that are allowed to access the view.
                               'admin', 'employee', or 'intern'
     """
-    if allowed_roles is None:
-        allowed_roles = []
-    
-    def check_user(user):
-        # A user must be authenticated
-        if not user.is_authenticated:
-            return False
-
-        try:
-            user_role = user.profile.role
-        except UserProfile.DoesNotExist:
-            # If no profile exists, create a default one
-            UserProfile.objects.create(user=user, role='employee')
-            user_role = 'employee'
-
-        # Check if user's role is in allowed roles
-        return user_role in allowed_roles
-
-    return user_passes_test(check_user, login_url='/login/')
\ No newline at end of file
+    # Freeze once at decoration time: O(1) membership per request, and a
+    # generator argument can no longer exhaust after the first check
+    allowed_roles = frozenset(allowed_roles or ())
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            # A user must be authenticated
+            if not request.user.is_authenticated:
+                return redirect_to_login(request.get_full_path(), '/login/')
+
+            user_role = request.session.get(SESSION_ROLE_KEY)
+            if user_role is None:
+                # The reverse one-to-one raises an AttributeError subclass
+                # when no profile exists, so getattr is a safe read-only
+                # lookup. Profiles are created by the post_save signal on
+                # User, not on the request path.
+                profile = getattr(request.user, 'profile', None)
+                user_role = profile.role if profile is not None else 'employee'
+                request.session[SESSION_ROLE_KEY] = user_role
+
+            # Check if user's role is in allowed roles
+            if user_role in allowed_roles:
+                return view_func(request, *args, **kwargs)
+            return redirect_to_login(request.get_full_path(), '/login/')
+
+        return _wrapped_view
+
+    return decorator
@@ -1,22 +1,28 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm, PasswordChangeForm, SetPasswordForm
 from django.contrib.auth.models import User
+from django.db import transaction
 from .models import UserProfile, WorkConfiguration
 
+# Shared Tailwind widget attrs, built once at import instead of per form instance
+_INPUT_ATTRS = {
+    'class': 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm placeholder-gray-400 focus:outline-none focus:ring-blue-500 focus:border-blue-500 sm:text-sm'
+}
+_SELECT_ATTRS = {
+    'class': 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-blue-500 focus:border-blue-500 sm:text-sm'
+}
+_NUMBER_ATTRS = {**_INPUT_ATTRS, 'step': '0.01', 'min': '0'}
+
+
 class LoginForm(AuthenticationForm):
     """
     A form for user login - inherits from AuthenticationForm properly.
     """
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['username'].widget.attrs.update({
-            'class': 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm placeholder-gray-400 focus:outline-none focus:ring-blue-500 focus:border-blue-500 sm:text-sm',
-            'id': 'username'
-        })
-        self.fields['password'].widget.attrs.update({
-            'class': 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm placeholder-gray-400 focus:outline-none focus:ring-blue-500 focus:border-blue-500 sm:text-sm',
-            'id': 'password'
-        })
+        for field_name in ('username', 'password'):
+            self.fields[field_name].widget.attrs.update(_INPUT_ATTRS)
+            self.fields[field_name].widget.attrs['id'] = field_name
 
 class RegistrationForm(UserCreationForm):
     """
@@ -49,16 +55,18 @@ class RegistrationForm(UserCreationForm):
             user.is_staff = False
         
         if commit:
-            user.save()
-            # Create the user profile with the role
-            UserProfile.objects.create(user=user, role=role)
-            # Create default work configuration
-            WorkConfiguration.objects.create(
-                user=user,
-                hours_per_day=8.00,
-                hourly_rate=0.00,
-                cutoff_type='15_30'
-            )
+            # One transaction (and one commit/fsync) for the user, profile and config rows
+            with transaction.atomic():
+                user.save()
+                # The post_save signal already created a default profile; set the chosen role
+                UserProfile.objects.update_or_create(user=user, defaults={'role': role})
+                # Create default work configuration
+                WorkConfiguration.objects.create(
+                    user=user,
+                    hours_per_day=8.00,
+                    hourly_rate=0.00,
+                    cutoff_type='15_30'
+                )
         
         return user
 
@@ -71,9 +79,7 @@ class CustomPasswordChangeForm(PasswordChangeForm):
         
         # Add CSS classes to all password fields
         for field_name in ['old_password', 'new_password1', 'new_password2']:
-            self.fields[field_name].widget.attrs.update({
-                'class': 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm placeholder-gray-400 focus:outline-none focus:ring-blue-500 focus:border-blue-500 sm:text-sm'
-            })
+            self.fields[field_name].widget.attrs.update(_INPUT_ATTRS)
 
 class AdminPasswordResetForm(SetPasswordForm):
     """
@@ -84,9 +90,7 @@ class AdminPasswordResetForm(SetPasswordForm):
         
         # Add CSS classes to password fields
         for field_name in ['new_password1', 'new_password2']:
-            self.fields[field_name].widget.attrs.update({
-                'class': 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm placeholder-gray-400 focus:outline-none focus:ring-blue-500 focus:border-blue-500 sm:text-sm'
-            })
+            self.fields[field_name].widget.attrs.update(_INPUT_ATTRS)
 
 class WorkConfigurationForm(forms.ModelForm):
     """
@@ -96,24 +100,10 @@ class WorkConfigurationForm(forms.ModelForm):
         model = WorkConfiguration
         fields = ['hours_per_day', 'hourly_rate', 'cutoff_type', 'bonus']
         widgets = {
-            'hours_per_day': forms.NumberInput(attrs={
-                'class': 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm placeholder-gray-400 focus:outline-none focus:ring-blue-500 focus:border-blue-500 sm:text-sm',
-                'step': '0.01',
-                'min': '0'
-            }),
-            'hourly_rate': forms.NumberInput(attrs={
-                'class': 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm placeholder-gray-400 focus:outline-none focus:ring-blue-500 focus:border-blue-500 sm:text-sm',
-                'step': '0.01',
-                'min': '0'
-            }),
-            'cutoff_type': forms.Select(attrs={
-                'class': 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-blue-500 focus:border-blue-500 sm:text-sm'
-            }),
-            'bonus': forms.NumberInput(attrs={
-                'class': 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm placeholder-gray-400 focus:outline-none focus:ring-blue-500 focus:border-blue-500 sm:text-sm',
-                'step': '0.01',
-                'min': '0'
-            }),
+            'hours_per_day': forms.NumberInput(attrs=_NUMBER_ATTRS),
+            'hourly_rate': forms.NumberInput(attrs=_NUMBER_ATTRS),
+            'cutoff_type': forms.Select(attrs=_SELECT_ATTRS),
+            'bonus': forms.NumberInput(attrs=_NUMBER_ATTRS),
         }
         labels = {
             'hours_per_day': 'Hours per Day',
@@ -9,15 +9,21 @@ class Command(BaseCommand):
     help = 'Create default work configurations for existing users'
 
     def handle(self, *args, **options):
-        users_without_config = User.objects.filter(work_config__isnull=True)
-        
-        for user in users_without_config:
-            WorkConfiguration.objects.create(
+        # Stream only the columns we need instead of materializing full User rows
+        users_without_config = User.objects.filter(
+            work_config__isnull=True
+        ).only('id', 'username').iterator(chunk_size=2000)
+
+        configs = [
+            WorkConfiguration(
                 user=user,
                 hours_per_day=8.00,
                 hourly_rate=15.00,  # Set your default rate
                 cutoff_type='15_30'
             )
-            self.stdout.write(
-                self.style.SUCCESS(f'Created work config for {user.username}')
-            )
\ No newline at end of file
+            for user in users_without_config
+        ]
+        WorkConfiguration.objects.bulk_create(configs, batch_size=1000, ignore_conflicts=True)
+        self.stdout.write(
+            self.style.SUCCESS(f'Created work configs for {len(configs)} users')
+        )
@@ -0,0 +1,51 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+
+# Module-level lock so concurrent requests can never start two cleanup workers
+_cleanup_lock = threading.Lock()
+
+# Resolve settings once at import; every read through LazySettings pays a
+# wrapped-object dict lookup that there is no reason to repeat
+_ENABLED = getattr(settings, 'PYCACHE_CLEANER_ENABLED', settings.DEBUG)
+_CLEANUP_INTERVAL = getattr(settings, 'PYCACHE_CLEANUP_INTERVAL', 3600)
+
+
+class PyCacheCleanerMiddleware:
+    """
+    Periodically runs the clean_pycache command in a background thread.
+
+    The request path only pays for a monotonic-clock read and a
+    non-blocking lock probe; the actual cleanup happens off-thread at
+    most once per interval.
+    """
+
+    def __init__(self, get_response):
+        if not _ENABLED:
+            # Drop out of the middleware chain entirely; requests then pay nothing
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.cleanup_interval = _CLEANUP_INTERVAL
+        self.last_cleanup = time.monotonic()
+
+    def __call__(self, request):
+        if (
+            time.monotonic() - self.last_cleanup > self.cleanup_interval
+            and _cleanup_lock.acquire(blocking=False)
+        ):
+            try:
+                self.last_cleanup = time.monotonic()
+                threading.Thread(target=self._cleanup_pycache, daemon=True).start()
+            except Exception:
+                _cleanup_lock.release()
+                raise
+        return self.get_response(request)
+
+    def _cleanup_pycache(self):
+        try:
+            call_command('clean_pycache')
+        finally:
+            _cleanup_lock.release()
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-08-29 05:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0008_alter_timestamp_options_workconfiguration_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timestamp',
+            index=models.Index(fields=['employee', '-timestamp'], name='app_timesta_employe_71a6db_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timestamp',
+            index=models.Index(fields=['timestamp'], name='app_timesta_timesta_8509fc_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-08-29 06:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0009_timestamp_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dailyworksummary',
+            index=models.Index(fields=['employee', 'date'], name='app_dailywo_employe_fdb948_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payrollperiod',
+            index=models.Index(fields=['employee', 'start_date', 'end_date'], name='app_payroll_employe_322670_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
+from django.utils.functional import cached_property
 from decimal import Decimal, ROUND_HALF_UP
 import datetime
 
@@ -22,6 +23,10 @@ class UserProfile(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.role}"
 
+    @cached_property
+    def is_admin(self):
+        return self.role == 'admin'
+
 class WorkConfiguration(models.Model):
     CUTOFF_CHOICES = (
         ('15_30', '15th and 30th of each month'),
@@ -54,6 +59,12 @@ class Timestamp(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            # Admin changelist / per-employee history: WHERE employee ORDER BY -timestamp
+            models.Index(fields=['employee', '-timestamp']),
+            # Date hierarchy and date filters on the full table
+            models.Index(fields=['timestamp']),
+        ]
 
 class DailyWorkSummary(models.Model):
     employee = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -75,52 +86,87 @@ class DailyWorkSummary(models.Model):
         ordering = ['-date']
         verbose_name = 'Daily Work Summary'
         verbose_name_plural = 'Daily Work Summaries'
+        indexes = [
+            # Explicit index for the (employee, date__range) scans; the
+            # unique_together constraint usually implies one but backends vary
+            models.Index(fields=['employee', 'date']),
+        ]
     
     def __str__(self):
         return f"{self.employee.username} - {self.date} ({self.total_hours}hrs)"
     
-    def calculate_late_deduction(self, late_minutes):
+    @staticmethod
+    def calculate_late_deduction(late_minutes):
         """
         Calculate late deduction based on the rule:
         1 minute late = 15 minutes deduction
         Additional minutes are added to the 15 minutes
+        (so the deduction is simply 14 + late_minutes)
         """
-        if late_minutes <= 0:
-            return 0
-        elif late_minutes == 1:
-            return 15
-        else:
-            return 15 + (late_minutes - 1)
+        return 0 if late_minutes <= 0 else 14 + late_minutes
     
-    def update_calculations(self):
-        """Update all calculations for this daily summary"""
-        try:
-            work_config = self.employee.work_config
-        except WorkConfiguration.DoesNotExist:
-            # Create default work config if none exists
-            work_config = WorkConfiguration.objects.create(
-                user=self.employee,
-                hours_per_day=8.00,
-                hourly_rate=0.00
-            )
-        
+    @classmethod
+    def compute_pay_fields(cls, total_hours, late_minutes, undertime_minutes, hourly_rate):
+        """
+        Derive the pay columns from the raw day figures, as a dict suitable
+        for update_or_create defaults.
+        """
         # Calculate late deduction
-        self.late_deduction_minutes = self.calculate_late_deduction(self.late_minutes)
-        
+        late_deduction_minutes = cls.calculate_late_deduction(late_minutes)
+
         # Calculate deductions in hours
-        total_deduction_minutes = self.late_deduction_minutes + self.undertime_minutes
+        total_deduction_minutes = late_deduction_minutes + undertime_minutes
         deduction_hours = Decimal(total_deduction_minutes) / Decimal(60)
-        
-        # Calculate gross pay (actual hours worked)
-        self.gross_pay = self.total_hours * work_config.hourly_rate
-        
-        # Calculate deductions amount
-        self.deductions = deduction_hours * work_config.hourly_rate
-        
-        # Calculate net pay
-        self.net_pay = self.gross_pay - self.deductions
-        
-        self.save()
+
+        # Gross pay is the actual hours worked; quantize money values with
+        # commercial (half-up) rounding
+        cents = Decimal('0.01')
+        gross_pay = (total_hours * hourly_rate).quantize(cents, rounding=ROUND_HALF_UP)
+        deductions = (deduction_hours * hourly_rate).quantize(cents, rounding=ROUND_HALF_UP)
+
+        return {
+            'late_deduction_minutes': late_deduction_minutes,
+            'gross_pay': gross_pay,
+            'deductions': deductions,
+            'net_pay': gross_pay - deductions,
+        }
+
+    def update_calculations(self, work_config=None):
+        """Update all calculations for this daily summary
+
+        Callers that already hold the employee's work config (e.g. the bulk
+        summary path) pass it in to avoid a lookup per summary.
+        """
+        if work_config is None:
+            try:
+                work_config = self.employee.work_config
+            except WorkConfiguration.DoesNotExist:
+                # Create default work config if none exists (race-safe)
+                work_config = WorkConfiguration.objects.get_or_create(
+                    user=self.employee,
+                    defaults={'hours_per_day': Decimal('8.00'), 'hourly_rate': Decimal('0.00')},
+                )[0]
+
+        # updated_at is auto_now and must be listed explicitly once
+        # update_fields narrows the UPDATE
+        pay_fields = ['late_deduction_minutes', 'gross_pay', 'deductions', 'net_pay', 'updated_at']
+
+        if work_config.hourly_rate == 0:
+            # Default configurations ship with rate 0.00; every pay column
+            # is zero, so skip the Decimal arithmetic entirely
+            self.late_deduction_minutes = self.calculate_late_deduction(self.late_minutes)
+            self.gross_pay = self.deductions = self.net_pay = Decimal('0.00')
+            self.save(update_fields=pay_fields)
+            return
+
+        computed = self.compute_pay_fields(
+            self.total_hours, self.late_minutes, self.undertime_minutes,
+            work_config.hourly_rate
+        )
+        for field, value in computed.items():
+            setattr(self, field, value)
+
+        self.save(update_fields=pay_fields)
 
 class PayrollPeriod(models.Model):
     PERIOD_TYPE_CHOICES = (
@@ -146,20 +192,28 @@ class PayrollPeriod(models.Model):
         ordering = ['-start_date']
         verbose_name = 'Payroll Period'
         verbose_name_plural = 'Payroll Periods'
+        indexes = [
+            models.Index(fields=['employee', 'start_date', 'end_date']),
+        ]
     
     def __str__(self):
         return f"{self.employee.username} - {self.start_date} to {self.end_date}"
     
     def calculate_totals(self):
         """Calculate totals from daily summaries"""
-        daily_summaries = DailyWorkSummary.objects.filter(
+        # One aggregate query instead of materializing every summary row
+        totals = DailyWorkSummary.objects.filter(
             employee=self.employee,
             date__range=[self.start_date, self.end_date]
+        ).aggregate(
+            total_hours=models.Sum('total_hours'),
+            total_gross_pay=models.Sum('gross_pay'),
+            total_deductions=models.Sum('deductions'),
         )
-        
-        self.total_hours = sum(summary.total_hours for summary in daily_summaries)
-        self.total_gross_pay = sum(summary.gross_pay for summary in daily_summaries)
-        self.total_deductions = sum(summary.deductions for summary in daily_summaries)
+
+        self.total_hours = totals['total_hours'] or Decimal('0.00')
+        self.total_gross_pay = totals['total_gross_pay'] or Decimal('0.00')
+        self.total_deductions = totals['total_deductions'] or Decimal('0.00')
         
         # Add bonus from work configuration
         try:
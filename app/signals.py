@@ -0,0 +1,12 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import UserProfile
+
+
+@receiver(post_save, sender=User)
+def create_user_profile(sender, instance, created, **kwargs):
+    """Give every new user a default profile so request paths never have to."""
+    if created:
+        UserProfile.objects.get_or_create(user=instance, defaults={'role': 'employee'})
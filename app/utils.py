@@ -1,136 +1,249 @@
+import calendar
+from collections import defaultdict
+from functools import lru_cache
+
+from django.core.cache import cache
 from django.utils import timezone
 from django.contrib.auth.models import User
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 import datetime
 from .models import Timestamp, DailyWorkSummary, WorkConfiguration, PayrollPeriod
 
-def calculate_daily_work_summary(user, date):
+# Work is assumed to start at 8:00 AM
+EXPECTED_START_TIME = datetime.time(8, 0)
+
+# Columns written when a daily summary is recalculated
+_DAY_FIELDS = [
+    'time_in', 'time_out', 'total_hours', 'late_minutes',
+    'undertime_minutes', 'late_deduction_minutes',
+    'gross_pay', 'deductions', 'net_pay',
+]
+
+def _day_start(date):
+    """Aware midnight for a date, for half-open timestamp range filters."""
+    return timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+
+def get_or_create_work_config(user):
+    """
+    Return the user's work configuration, honoring one already loaded via
+    select_related and lazily creating the defaults otherwise.
+    """
+    try:
+        return user.work_config
+    except WorkConfiguration.DoesNotExist:
+        # get_or_create rather than create: safe against a concurrent
+        # request materializing the same defaults
+        return WorkConfiguration.objects.get_or_create(
+            user=user,
+            defaults={'hours_per_day': Decimal('8.00'), 'hourly_rate': Decimal('0.00')},
+        )[0]
+
+def calculate_daily_work_summary(user, date, work_config=None):
     """
     Calculate daily work summary for a specific user and date
     """
-    # Get all timestamps for the user on the specific date
+    # Get all timestamps for the user on the specific date; only the two
+    # fields the math needs, as plain tuples. The half-open range keeps the
+    # filter sargable (timestamp__date wraps the column in DATE(), which
+    # defeats the (employee, timestamp) index)
+    day_start = _day_start(date)
     timestamps = Timestamp.objects.filter(
         employee=user,
-        timestamp__date=date
-    ).order_by('timestamp')
-    
-    if not timestamps.exists():
+        timestamp__gte=day_start,
+        timestamp__lt=day_start + datetime.timedelta(days=1),
+    ).order_by('timestamp').values_list('timestamp', 'is_entry')
+
+    # Materialize once; a separate exists() probe would be a second query
+    rows = list(timestamps)
+    if not rows:
         return None
-    
-    # Initialize values
-    time_in = None
-    time_out = None
-    total_minutes = 0
-    
-    # Process timestamps in pairs (entry, exit)
+
+    if work_config is None:
+        work_config = get_or_create_work_config(user)
+
+    expected_minutes = float(work_config.hours_per_day) * 60
+    return _summarize_day(user, date, rows, work_config, expected_minutes)
+
+def calculate_daily_summaries_bulk(user, start_date, end_date, work_config=None):
+    """
+    Recalculate daily summaries for every day in [start_date, end_date]
+    using a single timestamp fetch instead of one query per day.
+
+    Days without timestamps are skipped, matching the single-day helper.
+    Returns the list of summaries that were written, ordered by date.
+    """
+    timestamps = Timestamp.objects.filter(
+        employee=user,
+        timestamp__gte=_day_start(start_date),
+        timestamp__lt=_day_start(end_date + datetime.timedelta(days=1)),
+    ).order_by('timestamp').values_list('timestamp', 'is_entry')
+
+    # Bucket timestamps by day; ordering within each bucket is preserved
+    by_date = defaultdict(list)
+    for ts, is_entry in timestamps:
+        by_date[ts.date()].append((ts, is_entry))
+
+    if not by_date:
+        return []
+
+    # Get work configuration once for the whole range; the expected-minutes
+    # figure is constant across the range too
+    if work_config is None:
+        work_config = get_or_create_work_config(user)
+    expected_minutes = float(work_config.hours_per_day) * 60
+
+    # Preload existing summaries so each day is a pure in-memory update or
+    # a pending insert, then write both partitions in two batched queries
+    existing = {
+        summary.date: summary
+        for summary in DailyWorkSummary.objects.filter(
+            employee=user, date__range=(start_date, end_date)
+        )
+    }
+
+    summaries = []
+    to_create = []
+    to_update = []
+    for date, day_timestamps in sorted(by_date.items()):
+        fields = _compute_day_fields(day_timestamps, work_config, expected_minutes)
+        summary = existing.get(date)
+        if summary is None:
+            summary = DailyWorkSummary(employee=user, date=date, **fields)
+            to_create.append(summary)
+        else:
+            for field, value in fields.items():
+                setattr(summary, field, value)
+            to_update.append(summary)
+        summaries.append(summary)
+
+    if to_create:
+        DailyWorkSummary.objects.bulk_create(to_create, batch_size=500, ignore_conflicts=True)
+    if to_update:
+        DailyWorkSummary.objects.bulk_update(to_update, _DAY_FIELDS, batch_size=500)
+
+    return summaries
+
+def _summarize_day(user, date, timestamps, work_config, expected_minutes):
+    """
+    Compute and persist the daily summary for one day's timestamps,
+    given as an ordered sequence of (timestamp, is_entry) tuples.
+    """
+    daily_summary, _ = DailyWorkSummary.objects.update_or_create(
+        employee=user,
+        date=date,
+        defaults=_compute_day_fields(timestamps, work_config, expected_minutes),
+    )
+    return daily_summary
+
+def _compute_day_stats(timestamps, expected_minutes):
+    """
+    Pure day arithmetic over an ordered sequence of (datetime, is_entry)
+    tuples. No ORM or model access, so it is callable from any path (or
+    worker) without a database connection.
+
+    Returns (time_in, time_out, total_seconds, late_minutes,
+    undertime_minutes); the times are datetime.time or None.
+    """
+    # Split into entry and exit times (one pass, plain datetime lists)
     entries = []
     exits = []
-    
-    for timestamp in timestamps:
-        if timestamp.is_entry:
-            entries.append(timestamp)
-        else:
-            exits.append(timestamp)
-    
-    # Calculate total work time
-    work_sessions = []
-    for i, entry in enumerate(entries):
-        if i < len(exits):
-            exit_time = exits[i]
-            duration = (exit_time.timestamp - entry.timestamp).total_seconds() / 60
-            work_sessions.append({
-                'entry': entry.timestamp,
-                'exit': exit_time.timestamp,
-                'duration': duration
-            })
-            total_minutes += duration
+
+    for ts, is_entry in timestamps:
+        if is_entry:
+            entries.append(ts)
         else:
-            # Entry without exit (still working or forgot to punch out)
-            work_sessions.append({
-                'entry': entry.timestamp,
-                'exit': None,
-                'duration': 0
-            })
-    
-    # Set time_in as first entry and time_out as last exit
-    if entries:
-        time_in = entries[0].timestamp.time()
-    if exits:
-        time_out = exits[-1].timestamp.time()
-    
-    # Calculate total hours
-    total_hours = Decimal(str(total_minutes / 60)).quantize(Decimal('0.01'))
-    
-    # Get work configuration
-    try:
-        work_config = user.work_config
-    except WorkConfiguration.DoesNotExist:
-        work_config = WorkConfiguration.objects.create(
-            user=user,
-            hours_per_day=8.00,
-            hourly_rate=0.00
-        )
-    
-    # Calculate late minutes (assuming work starts at 8:00 AM)
-    expected_start_time = datetime.time(8, 0)  # 8:00 AM
+            exits.append(ts)
+
+    # Pair entries with exits positionally; zip truncates to the shorter
+    # list, so a trailing entry without an exit (still working or forgot
+    # to punch out) contributes no time
+    total_seconds = 0
+    for entry_time, exit_time in zip(entries, exits):
+        total_seconds += int((exit_time - entry_time).total_seconds())
+
+    # time_in is the first entry and time_out the last exit
+    time_in = entries[0].time() if entries else None
+    time_out = exits[-1].time() if exits else None
+
+    # Calculate late minutes against the expected start, on the clock face
     late_minutes = 0
-    
-    if time_in and time_in > expected_start_time:
-        start_datetime = datetime.datetime.combine(date, expected_start_time)
-        actual_datetime = datetime.datetime.combine(date, time_in)
-        late_minutes = int((actual_datetime - start_datetime).total_seconds() / 60)
-    
+    if time_in and time_in > EXPECTED_START_TIME:
+        late_seconds = (
+            (time_in.hour - EXPECTED_START_TIME.hour) * 3600
+            + (time_in.minute - EXPECTED_START_TIME.minute) * 60
+            + (time_in.second - EXPECTED_START_TIME.second)
+        )
+        late_minutes = late_seconds // 60
+
     # Calculate undertime minutes
-    expected_hours = work_config.hours_per_day
-    expected_minutes = float(expected_hours) * 60
-    undertime_minutes = max(0, int(expected_minutes - total_minutes))
-    
-    # Get or create daily summary
-    daily_summary, created = DailyWorkSummary.objects.get_or_create(
-        employee=user,
-        date=date,
-        defaults={
-            'time_in': time_in,
-            'time_out': time_out,
-            'total_hours': total_hours,
-            'late_minutes': late_minutes,
-            'undertime_minutes': undertime_minutes,
-        }
+    undertime_minutes = max(0, int(expected_minutes - total_seconds / 60))
+
+    return time_in, time_out, total_seconds, late_minutes, undertime_minutes
+
+def _compute_day_fields(timestamps, work_config, expected_minutes):
+    """
+    Compute every DailyWorkSummary column for one day's (timestamp,
+    is_entry) tuples, returned as a field dict.
+    """
+    time_in, time_out, total_seconds, late_minutes, undertime_minutes = (
+        _compute_day_stats(timestamps, expected_minutes)
     )
-    
-    if not created:
-        # Update existing summary
-        daily_summary.time_in = time_in
-        daily_summary.time_out = time_out
-        daily_summary.total_hours = total_hours
-        daily_summary.late_minutes = late_minutes
-        daily_summary.undertime_minutes = undertime_minutes
-        daily_summary.save()
-    
-    # Update calculations
-    daily_summary.update_calculations()
-    
-    return daily_summary
+
+    # Calculate total hours with commercial rounding, staying in Decimal
+    # rather than routing through a float and its repr
+    total_hours = (Decimal(total_seconds) / Decimal(3600)).quantize(
+        Decimal('0.01'), rounding=ROUND_HALF_UP
+    )
+
+    # Derive the pay columns alongside the raw figures
+    fields = {
+        'time_in': time_in,
+        'time_out': time_out,
+        'total_hours': total_hours,
+        'late_minutes': late_minutes,
+        'undertime_minutes': undertime_minutes,
+    }
+    fields.update(DailyWorkSummary.compute_pay_fields(
+        total_hours, late_minutes, undertime_minutes, work_config.hourly_rate
+    ))
+    return fields
+
+# How long a generated payroll period may be served from cache before a
+# read path regenerates it
+PAYROLL_CACHE_TTL = 60
+
+def _payroll_cache_key(user_id, start_date, end_date):
+    return f'payroll:{user_id}:{start_date}:{end_date}'
+
+def get_cached_payroll_period(user, start_date, end_date):
+    """
+    Cached front for generate_payroll_period on read-mostly paths.
+
+    Dashboards and the payroll-summary API regenerate the period on every
+    load, which recalculates summaries and rewrites the PayrollPeriod row.
+    Within the TTL, repeated reads reuse the cached row instead; a punch
+    invalidates the key (see invalidate_payroll_period_cache) so new time
+    shows up immediately.
+    """
+    period = cache.get(_payroll_cache_key(user.id, start_date, end_date))
+    if period is not None:
+        return period
+    # generate_payroll_period refreshes the cache itself
+    return generate_payroll_period(user, start_date, end_date)
+
+def invalidate_payroll_period_cache(user, start_date, end_date):
+    """Drop the cached period so the next read regenerates it."""
+    cache.delete(_payroll_cache_key(user.id, start_date, end_date))
 
 def generate_payroll_period(user, start_date, end_date):
     """
     Generate payroll period for a user between two dates
     """
-    try:
-        work_config = user.work_config
-    except WorkConfiguration.DoesNotExist:
-        work_config = WorkConfiguration.objects.create(
-            user=user,
-            hours_per_day=8.00,
-            hourly_rate=0.00
-        )
-    
-    # Calculate daily summaries for all days in the period
-    current_date = start_date
-    while current_date <= end_date:
-        calculate_daily_work_summary(user, current_date)
-        current_date += datetime.timedelta(days=1)
-    
+    work_config = get_or_create_work_config(user)
+
+    # Calculate daily summaries for all days in the period in one pass
+    calculate_daily_summaries_bulk(user, start_date, end_date, work_config=work_config)
+
     # Get or create payroll period
     payroll_period, created = PayrollPeriod.objects.get_or_create(
         employee=user,
@@ -140,52 +253,86 @@ def generate_payroll_period(user, start_date, end_date):
             'period_type': work_config.cutoff_type,
         }
     )
-    
+
     if not created:
         payroll_period.period_type = work_config.cutoff_type
         payroll_period.save()
-    
+
     # Calculate totals
     payroll_period.calculate_totals()
-    
+
+    cache.set(
+        _payroll_cache_key(user.id, start_date, end_date),
+        payroll_period,
+        PAYROLL_CACHE_TTL,
+    )
+
     return payroll_period
 
 def get_current_payroll_dates(cutoff_type):
     """
     Get current payroll period dates based on cutoff type
     """
-    today = timezone.now().date()
-    
+    return _payroll_dates(cutoff_type, timezone.localdate())
+
+@lru_cache(maxsize=32)
+def _payroll_dates(cutoff_type, today):
+    """
+    Period bounds for a cutoff type on a given day. Memoized: the inputs
+    form a tiny set (three cutoff types times the current date), so after
+    the first request each combination is a dict hit until the date rolls
+    over and the stale entries age out of the LRU.
+    """
     if cutoff_type == '15_30':
         if today.day <= 15:
             start_date = today.replace(day=1)
             end_date = today.replace(day=15)
         else:
             start_date = today.replace(day=16)
-            # Get last day of month
-            if today.month == 12:
-                next_month = today.replace(year=today.year + 1, month=1, day=1)
-            else:
-                next_month = today.replace(month=today.month + 1, day=1)
-            end_date = next_month - datetime.timedelta(days=1)
-    
+            # Last day of month, without the year-rollover branch
+            end_date = today.replace(day=calendar.monthrange(today.year, today.month)[1])
+
     elif cutoff_type == 'weekly':
         # Get Monday of current week
         days_since_monday = today.weekday()
         start_date = today - datetime.timedelta(days=days_since_monday)
         end_date = start_date + datetime.timedelta(days=6)
-    
+
     else:  # daily
         start_date = today
         end_date = today
-    
+
     return start_date, end_date
 
+# How long a recompute of the trailing summary window stays "fresh";
+# punches refresh it, since they recalculate the day they touch
+SUMMARY_REFRESH_TTL = 300
+
+def _summaries_fresh_key(user_id):
+    return f'dailysum:{user_id}'
+
+def mark_daily_summaries_fresh(user):
+    """
+    Record that the user's summaries are up to date, debouncing the next
+    update_user_daily_summaries call. The punch API calls this after
+    recalculating today: past days only change via punches, which handle
+    their own day, so the trailing window stays valid.
+    """
+    cache.set(_summaries_fresh_key(user.id), True, SUMMARY_REFRESH_TTL)
+
 def update_user_daily_summaries(user, num_days=30):
     """
-    Update daily summaries for a user for the last N days
+    Update daily summaries for a user for the last N days.
+
+    Debounced: if the window was recomputed (or kept fresh by a punch)
+    within SUMMARY_REFRESH_TTL, this returns None without touching the
+    database, so page views don't redo 30 days of work on every load.
     """
-    today = timezone.now().date()
-    for i in range(num_days):
-        date = today - datetime.timedelta(days=i)
-        calculate_daily_work_summary(user, date)
\ No newline at end of file
+    if cache.get(_summaries_fresh_key(user.id)):
+        return None
+
+    today = timezone.localdate()
+    start_date = today - datetime.timedelta(days=num_days - 1)
+    summaries = calculate_daily_summaries_bulk(user, start_date, today)
+    mark_daily_summaries_fresh(user)
+    return summaries
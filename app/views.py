@@ -3,17 +3,27 @@ from django.contrib.auth import authenticate, login, logout, update_session_auth
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse
+from django.core.paginator import Paginator
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.cache import cache_page
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition, require_POST
+from django.views.decorators.vary import vary_on_cookie
 from django.utils import timezone
-from django.db.models import Q, Sum, Avg
-import json
+from django.db.models import Q, Sum, Avg, Max, OuterRef, Subquery
 import datetime
+import orjson
 
-from .decorators import role_required
+from .decorators import SESSION_ROLE_KEY, role_required
 from .models import Timestamp, UserProfile, WorkConfiguration, DailyWorkSummary, PayrollPeriod
 from .forms import LoginForm, RegistrationForm, CustomPasswordChangeForm, AdminPasswordResetForm, WorkConfigurationForm
-from .utils import calculate_daily_work_summary, generate_payroll_period, get_current_payroll_dates, update_user_daily_summaries
+from .utils import (
+    calculate_daily_work_summary, generate_payroll_period,
+    get_cached_payroll_period, get_current_payroll_dates,
+    get_or_create_work_config,
+    invalidate_payroll_period_cache, mark_daily_summaries_fresh,
+    update_user_daily_summaries,
+)
 
 # This new view acts as the landing page router
 def landing_page(request):
@@ -27,35 +37,41 @@ def landing_page(request):
     else:
         return redirect('login')
 
-# This view is for employees and interns
+# This view is for employees and interns.
+# Cached for a short window per session cookie: repeated reloads reuse
+# the rendered page, and the 30s TTL keeps fresh punches visible quickly.
 @role_required(allowed_roles=['employee', 'intern'])
+@cache_page(30)
+@vary_on_cookie
 def employee_dashboard(request):
     """
     Renders the employee dashboard with payroll information.
     """
-    # Update daily summaries for the last 30 days
-    update_user_daily_summaries(request.user, 30)
-    
+    # Update daily summaries for the last 30 days (None when debounced)
+    month_summaries = update_user_daily_summaries(request.user, 30)
+
     # Get current payroll information
-    try:
-        work_config = request.user.work_config
-    except WorkConfiguration.DoesNotExist:
-        work_config = WorkConfiguration.objects.create(
-            user=request.user,
-            hours_per_day=8.00,
-            hourly_rate=0.00
-        )
-    
-    # Get current payroll period
+    work_config = get_or_create_work_config(request.user)
+
+    # Get current payroll period (cached briefly; punches invalidate it)
     start_date, end_date = get_current_payroll_dates(work_config.cutoff_type)
-    current_payroll = generate_payroll_period(request.user, start_date, end_date)
-    
-    # Get recent daily summaries
-    recent_summaries = DailyWorkSummary.objects.filter(
-        employee=request.user,
-        date__range=[start_date, end_date]
-    ).order_by('-date')[:10]
-    
+    current_payroll = get_cached_payroll_period(request.user, start_date, end_date)
+
+    # Get recent daily summaries. The recompute just touched these exact
+    # rows, so slice its return value (date ascending, period is within
+    # the 30-day window) instead of querying them again; fall back to the
+    # database only when the recompute was debounced.
+    if month_summaries is not None:
+        recent_summaries = [
+            summary for summary in reversed(month_summaries)
+            if start_date <= summary.date <= end_date
+        ][:10]
+    else:
+        recent_summaries = DailyWorkSummary.objects.filter(
+            employee=request.user,
+            date__range=[start_date, end_date]
+        ).order_by('-date')[:10]
+
     # Get all payroll periods
     all_payrolls = PayrollPeriod.objects.filter(
         employee=request.user
@@ -69,24 +85,41 @@ def employee_dashboard(request):
     }
     return render(request, 'pages/employee_dashboard.html', context)
 
-# This view is for admins only
+# This view is for admins only; cached per session cookie like the
+# employee dashboard
 @role_required(allowed_roles=['admin'])
+@cache_page(30)
+@vary_on_cookie
 def admin_dashboard(request):
     """
     Renders the admin dashboard with user and timestamp data.
     """
-    users_with_timestamps = User.objects.all().prefetch_related('timestamp_set', 'profile', 'work_config')
-    
+    today = timezone.localdate()
+
+    # Two bounded queries for the whole page. The last punch comes from
+    # correlated subqueries on the main user query — unlike the earlier
+    # Prefetch, this never materializes each user's full punch history.
+    # profile and work_config are one-to-one, so select_related folds them
+    # into the main query's JOIN.
+    last_ts = Timestamp.objects.filter(employee=OuterRef('pk')).order_by('-timestamp')
+    users_with_timestamps = User.objects.select_related(
+        'profile', 'work_config'
+    ).annotate(
+        last_ts_time=Subquery(last_ts.values('timestamp')[:1]),
+        last_ts_entry=Subquery(last_ts.values('is_entry')[:1]),
+    )
+
+    # The template reads several summary columns, so one filtered query
+    # joined back in Python beats a subquery per column
+    today_summaries = {
+        summary.employee_id: summary
+        for summary in DailyWorkSummary.objects.filter(
+            date=today, employee__in=users_with_timestamps
+        )
+    }
+
     for user in users_with_timestamps:
-        user.last_timestamp = user.timestamp_set.order_by('-timestamp').first()
-        
-        # Get today's work summary
-        today = timezone.now().date()
-        today_summary = DailyWorkSummary.objects.filter(
-            employee=user,
-            date=today
-        ).first()
-        user.today_summary = today_summary
+        user.today_summary = today_summaries.get(user.id)
 
     context = {
         'users': users_with_timestamps,
@@ -100,16 +133,8 @@ def edit_work_config(request, user_id):
     Edit work configuration for a user
     """
     target_user = get_object_or_404(User, id=user_id)
-    
-    try:
-        work_config = target_user.work_config
-    except WorkConfiguration.DoesNotExist:
-        work_config = WorkConfiguration.objects.create(
-            user=target_user,
-            hours_per_day=8.00,
-            hourly_rate=0.00
-        )
-    
+    work_config = get_or_create_work_config(target_user)
+
     if request.method == 'POST':
         form = WorkConfigurationForm(request.POST, instance=work_config)
         if form.is_valid():
@@ -139,11 +164,14 @@ def user_payroll(request, user_id):
     # Update daily summaries for the last 30 days
     update_user_daily_summaries(target_user, 30)
     
-    # Get payroll periods
-    payroll_periods = PayrollPeriod.objects.filter(
-        employee=target_user
-    ).order_by('-start_date')
-    
+    # Get payroll periods, a page at a time; long-tenured users can have
+    # hundreds and the template renders a card per period
+    paginator = Paginator(
+        PayrollPeriod.objects.filter(employee=target_user).order_by('-start_date'),
+        20,
+    )
+    payroll_periods = paginator.get_page(request.GET.get('page'))
+
     # Get recent daily summaries
     recent_summaries = DailyWorkSummary.objects.filter(
         employee=target_user
@@ -165,9 +193,15 @@ def generate_payroll(request, user_id):
     target_user = get_object_or_404(User, id=user_id)
     
     if request.method == 'POST':
-        start_date = datetime.datetime.strptime(request.POST.get('start_date'), '%Y-%m-%d').date()
-        end_date = datetime.datetime.strptime(request.POST.get('end_date'), '%Y-%m-%d').date()
-        
+        # fromisoformat parses YYYY-MM-DD in C, without strptime's
+        # format-string machinery; bad input gets a message instead of a 500
+        try:
+            start_date = datetime.date.fromisoformat(request.POST.get('start_date', ''))
+            end_date = datetime.date.fromisoformat(request.POST.get('end_date', ''))
+        except ValueError:
+            messages.error(request, 'Invalid date range submitted.')
+            return redirect('user_payroll', user_id=user_id)
+
         payroll_period = generate_payroll_period(target_user, start_date, end_date)
         messages.success(request, f'Payroll generated for {target_user.username} ({start_date} to {end_date})')
         
@@ -190,17 +224,21 @@ def user_login(request):
                 login(request, user)
                 messages.success(request, f"Welcome back, {username}!")
                 
-                # Redirect based on user's role using the profile
-                try:
-                    if user.profile.role == 'admin':
-                        return redirect('admin_dashboard')
-                    else:
-                        return redirect('employee_dashboard')
-                except UserProfile.DoesNotExist:
+                # Redirect based on user's role; one projected query
+                # instead of hydrating the profile just for its role
+                role = UserProfile.objects.filter(
+                    user=user
+                ).values_list('role', flat=True).first()
+                if role is None:
                     # If no profile exists, create a default one
                     UserProfile.objects.create(user=user, role='employee')
-                    WorkConfiguration.objects.create(user=user, hours_per_day=8.00, hourly_rate=0.00)
-                    return redirect('employee_dashboard')
+                    get_or_create_work_config(user)
+                    role = 'employee'
+                # Seed the session cache read by role_required
+                request.session[SESSION_ROLE_KEY] = role
+                if role == 'admin':
+                    return redirect('admin_dashboard')
+                return redirect('employee_dashboard')
             else:
                 messages.error(request, "Invalid username or password.")
         else:
@@ -252,14 +290,12 @@ def change_password(request):
             update_session_auth_hash(request, user)  # Important!
             messages.success(request, 'Your password was successfully updated!')
             
-            # Redirect based on user role
-            try:
-                if request.user.profile.role == 'admin':
-                    return redirect('admin_dashboard')
-                else:
-                    return redirect('employee_dashboard')
-            except UserProfile.DoesNotExist:
-                return redirect('employee_dashboard')
+            # Redirect based on user role; the auth backend select_relates
+            # the profile, so this reads the cached relation without a query
+            profile = getattr(request.user, 'profile', None)
+            if profile is not None and profile.role == 'admin':
+                return redirect('admin_dashboard')
+            return redirect('employee_dashboard')
         else:
             messages.error(request, 'Please correct the error below.')
     else:
@@ -299,26 +335,25 @@ def user_detail(request, user_id):
     Shows detailed view of a user for admin.
     """
     target_user = get_object_or_404(User, id=user_id)
-    recent_timestamps = Timestamp.objects.filter(employee=target_user).order_by('-timestamp')[:20]
+    # Restrict both lists to the columns the template renders
+    recent_timestamps = Timestamp.objects.filter(
+        employee=target_user
+    ).order_by('-timestamp').only('timestamp', 'is_entry')[:20]
     
     # Get work configuration
-    try:
-        work_config = target_user.work_config
-    except WorkConfiguration.DoesNotExist:
-        work_config = WorkConfiguration.objects.create(
-            user=target_user,
-            hours_per_day=8.00,
-            hourly_rate=0.00
-        )
-    
+    work_config = get_or_create_work_config(target_user)
+
     # Get recent daily summaries
     recent_summaries = DailyWorkSummary.objects.filter(
         employee=target_user
-    ).order_by('-date')[:10]
-    
-    # Get current payroll info
+    ).order_by('-date').only(
+        'date', 'time_in', 'time_out', 'total_hours',
+        'late_deduction_minutes', 'net_pay',
+    )[:10]
+
+    # Get current payroll info (cached briefly; punches invalidate it)
     start_date, end_date = get_current_payroll_dates(work_config.cutoff_type)
-    current_payroll = generate_payroll_period(target_user, start_date, end_date)
+    current_payroll = get_cached_payroll_period(target_user, start_date, end_date)
     
     context = {
         'target_user': target_user,
@@ -331,42 +366,100 @@ def user_detail(request, user_id):
 
 # --- API ENDPOINTS FOR FRONTEND ---
 
+class OrjsonResponse(HttpResponse):
+    """
+    JSON response serialized with orjson instead of the stdlib encoder.
+    orjson serializes datetimes natively and formats numbers in C, which
+    matters most for api_get_logs' list payloads.
+    """
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=orjson.dumps(data), **kwargs)
+
+def _logs_last_modified(request, *args, **kwargs):
+    """
+    Last-Modified source for api_get_logs: the user's newest punch.
+    Frontends poll this endpoint, and an unchanged maximum means an
+    unchanged page for the same query parameters, so most polls collapse
+    to a 304 after one indexed MAX lookup.
+    """
+    if not request.user.is_authenticated:
+        return None
+    return Timestamp.objects.filter(employee=request.user).aggregate(
+        last=Max('timestamp')
+    )['last']
+
 @csrf_exempt
+@condition(last_modified_func=_logs_last_modified)
 def api_get_logs(request):
     """
     API endpoint to get a list of the authenticated user's time logs.
     """
     if not request.user.is_authenticated:
         return JsonResponse({'error': 'Authentication required'}, status=401)
-    
-    logs = Timestamp.objects.filter(employee=request.user).order_by('-timestamp').values('timestamp', 'is_entry')
-    return JsonResponse(list(logs), safe=False)
+
+    # Bound the response instead of returning the full history. ?limit=
+    # caps the page (default 100) and ?before=<iso datetime> is a keyset
+    # cursor: pass the oldest timestamp from the previous page to fetch
+    # the next one, which stays an index seek at any depth unlike OFFSET.
+    try:
+        limit = int(request.GET.get('limit', 100))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid limit parameter'}, status=400)
+    limit = max(1, min(limit, 1000))
+
+    logs = Timestamp.objects.filter(employee=request.user)
+
+    before = request.GET.get('before')
+    if before:
+        try:
+            before_dt = datetime.datetime.fromisoformat(before)
+        except ValueError:
+            return JsonResponse({'error': 'Invalid before parameter'}, status=400)
+        if timezone.is_naive(before_dt):
+            before_dt = timezone.make_aware(before_dt)
+        logs = logs.filter(timestamp__lt=before_dt)
+
+    logs = logs.order_by('-timestamp').values('timestamp', 'is_entry')[:limit]
+    return OrjsonResponse(list(logs))
 
 @csrf_exempt
+@require_POST
 def api_create_timestamp(request):
     """
     API endpoint to create a new timestamp for the authenticated user.
+    POST only; other methods are rejected before the view body runs.
     """
     if not request.user.is_authenticated:
         return JsonResponse({'error': 'Authentication required'}, status=401)
 
-    if request.method == 'POST':
-        # Get the last log to determine if the new one is an entry or exit
-        last_log = Timestamp.objects.filter(employee=request.user).order_by('-timestamp').first()
-        is_entry = True
-        if last_log and last_log.is_entry:
-            is_entry = False
+    # Only the last log's is_entry flag decides the punch direction, so
+    # project that one column instead of hydrating a model instance.
+    # No previous log (None) means this punch is an entry.
+    last_was_entry = Timestamp.objects.filter(
+        employee=request.user
+    ).order_by('-timestamp').values_list('is_entry', flat=True).first()
+    is_entry = not last_was_entry
 
-        timestamp_obj = Timestamp.objects.create(employee=request.user, is_entry=is_entry)
-        
-        # Update daily work summary for today
-        today = timezone.now().date()
-        calculate_daily_work_summary(request.user, today)
-        
-        message = "You have successfully punched in." if is_entry else "You have successfully punched out."
-        return JsonResponse({'success': True, 'message': message})
-    
-    return JsonResponse({'error': 'Invalid request method'}, status=405)
+    Timestamp.objects.create(employee=request.user, is_entry=is_entry)
+
+    # Update daily work summary for today; that keeps the trailing
+    # window fresh, so the dashboards' 30-day recompute stays debounced
+    today = timezone.localdate()
+    calculate_daily_work_summary(request.user, today)
+    mark_daily_summaries_fresh(request.user)
+
+    # The punch changes the current period's totals; drop the cached
+    # payroll row so the next dashboard load regenerates it
+    cutoff_type = WorkConfiguration.objects.filter(
+        user=request.user
+    ).values_list('cutoff_type', flat=True).first()
+    if cutoff_type:
+        period_start, period_end = get_current_payroll_dates(cutoff_type)
+        invalidate_payroll_period_cache(request.user, period_start, period_end)
+
+    message = "You have successfully punched in." if is_entry else "You have successfully punched out."
+    return JsonResponse({'success': True, 'message': message})
 
 @csrf_exempt
 def api_get_payroll_summary(request):
@@ -381,10 +474,10 @@ def api_get_payroll_summary(request):
     except WorkConfiguration.DoesNotExist:
         return JsonResponse({'error': 'Work configuration not found'}, status=404)
     
-    # Get current payroll period
+    # Get current payroll period (cached briefly; punches invalidate it)
     start_date, end_date = get_current_payroll_dates(work_config.cutoff_type)
-    current_payroll = generate_payroll_period(request.user, start_date, end_date)
-    
+    current_payroll = get_cached_payroll_period(request.user, start_date, end_date)
+
     data = {
         'period_start': start_date.strftime('%Y-%m-%d'),
         'period_end': end_date.strftime('%Y-%m-%d'),
@@ -395,5 +488,5 @@ def api_get_payroll_summary(request):
         'net_pay': float(current_payroll.net_pay),
         'hourly_rate': float(work_config.hourly_rate),
     }
-    
-    return JsonResponse(data)
\ No newline at end of file
+
+    return OrjsonResponse(data)
\ No newline at end of file
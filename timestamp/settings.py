@@ -53,6 +53,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'app.middleware.PyCacheCleanerMiddleware',
 ]
 
 ROOT_URLCONF = 'timestamp.urls'
@@ -61,8 +62,16 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Cache compiled templates per process instead of re-reading and
+            # re-parsing them on every render (APP_DIRS is implied by the
+            # app_directories loader and may not be set alongside 'loaders')
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
@@ -74,6 +83,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'timestamp.wsgi.application'
 
+# Hydrate profile/work_config alongside the session user (single JOINed query)
+AUTHENTICATION_BACKENDS = ['app.backends.ProfileSelectRelatedBackend']
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases